@@ -62,13 +62,29 @@ the situation when an application charm requests a new database to be created.
 It's preferred to subscribe to this event instead of relation changed event to avoid
 creating a new database when other information other than a database name is
 exchanged in the relation databag.
+
+Several fields can also be set with a single relation data update, either using
+`set_many` or by grouping the setters in a `batch` block:
+
+```python
+with self.provided_database.batch(event.relation.id) as database:
+    database.set_credentials(event.relation.id, username, password)
+    database.set_endpoints(event.relation.id, endpoints)
+```
 """
 import json
 import logging
 from collections import namedtuple
-from typing import List, Optional
-
-from ops.charm import CharmBase, CharmEvents, RelationChangedEvent, RelationEvent
+from contextlib import contextmanager
+from typing import Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from ops.charm import (
+    CharmBase,
+    CharmEvents,
+    RelationBrokenEvent,
+    RelationChangedEvent,
+    RelationEvent,
+)
 from ops.framework import EventSource, Object
 from ops.model import Relation
 
@@ -80,10 +96,41 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 2
+LIBPATCH = 3
 
 logger = logging.getLogger(__name__)
 
+# Sentinel for the keys missing from the diff data.
+_MISSING = object()
+
+# Use orjson to (de)serialize the diff data when it's available in the charm.
+try:
+    import orjson
+
+    def _dumps(data: dict) -> str:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS).decode()
+
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(data: dict) -> str:
+        return json.dumps(data, sort_keys=True, separators=(",", ":"))
+
+    _loads = json.loads
+
+# Relation databag keys indexed by the name of the field used to set them.
+_RELATION_DATA_KEYS = {
+    "endpoints": "endpoints",
+    "password": "password",
+    "read_only_endpoints": "read-only-endpoints",
+    "replset": "replset",
+    "tls": "tls",
+    "tls_ca": "tls_ca",
+    "uris": "uris",
+    "username": "username",
+    "version": "version",
+}
+
 
 class DatabaseEvent(RelationEvent):
     """Base class for database events."""
@@ -114,7 +161,7 @@ class DatabaseEvents(CharmEvents):
 
 Diff = namedtuple("Diff", "added changed deleted")
 Diff.__doc__ = """
-A tuple for storing the diff between two data mappings.
+A tuple for storing the diff between two data mappings (as frozensets of keys).
 
 added - keys that were added
 changed - keys that still exist but have new values
@@ -126,16 +173,32 @@ class DatabaseProvides(Object):
 
     on = DatabaseEvents()
 
+    # Keys that the application adds to the relation databag to request a resource,
+    # and name of the event emitted when any of them is added.
+    TRIGGER_KEYS: FrozenSet[str] = frozenset({"database"})
+    TRIGGER_EVENT_NAME = "database_requested"
+
     def __init__(self, charm: CharmBase, relation_name: str) -> None:
         super().__init__(charm, relation_name)
         self.charm = charm
         self.local_app = self.charm.model.app
         self.local_unit = self.charm.unit
         self.relation_name = relation_name
+        # Diff data stored in the relation databag and its current parsed form,
+        # indexed by relation id, plus the relations whose diff data must be saved.
+        self._diff_cache: Dict[int, Tuple[Optional[str], dict]] = {}
+        self._unsaved_diffs: Set[int] = set()
+        # Relation data accumulated by the open batches, indexed by relation id.
+        self._batches: Dict[int, dict] = {}
         self.framework.observe(
             charm.on[relation_name].relation_changed,
             self._on_relation_changed,
         )
+        self.framework.observe(
+            charm.on[relation_name].relation_broken,
+            self._on_relation_broken,
+        )
+        self.framework.observe(self.framework.on.pre_commit, self._on_pre_commit)
 
     def _diff(self, event: RelationChangedEvent) -> Diff:
         """Retrieves the diff of the data in the relation changed databag.
@@ -147,30 +210,61 @@ class DatabaseProvides(Object):
             a Diff instance containing the added, deleted and changed
                 keys from the event relation databag.
         """
-        # Retrieve the old data from the data key in the application relation databag.
-        old_data = json.loads(event.relation.data[self.local_app].get("data", "{}"))
-        # Retrieve the new data from the event relation databag.
-        new_data = {
-            key: value for key, value in event.relation.data[event.app].items() if key != "data"
-        }
-
-        # These are the keys that were added to the databag and triggered this event.
-        added = new_data.keys() - old_data.keys()
+        relation_id = event.relation.id
+        # Retrieve the old data from the data key in the application relation databag,
+        # unless it's already known by this instance (with the changes not saved yet).
+        raw_data = event.relation.data[self.local_app].get("data")
+        if relation_id in self._diff_cache and self._diff_cache[relation_id][0] == raw_data:
+            old_data = self._diff_cache[relation_id][1]
+        else:
+            old_data = _loads(raw_data or "{}")
+            self._diff_cache[relation_id] = (raw_data, old_data)
+        # Retrieve a snapshot of the new data from the event relation databag.
+        new_data = dict(event.relation.data[event.app])
+        new_data.pop("data", None)
+
+        # Keys that were added to the databag and triggered this event, and keys
+        # that already existed in the databag, but had their values changed.
+        # Only their new values are kept, to be saved for a next diff check.
+        added, changed, updated_data = set(), set(), {}
+        for key, value in new_data.items():
+            old_value = old_data.get(key, _MISSING)
+            if old_value is _MISSING:
+                added.add(key)
+            elif old_value != value:
+                changed.add(key)
+            else:
+                continue
+            updated_data[key] = value
         # These are the keys that were removed from the databag and triggered this event.
-        deleted = old_data.keys() - new_data.keys()
-        # These are the keys that already existed in the databag,
-        # but had their values changed.
-        changed = {
-            key for key in old_data.keys() & new_data.keys() if old_data[key] != new_data[key]
-        }
+        deleted = frozenset(key for key in old_data if key not in new_data)
 
         # TODO: evaluate the possibility of losing the diff if some error
         # happens in the charm before the diff is completely checked (DPE-412).
-        # Convert the new_data to a serializable format and save it for a next diff check.
-        event.relation.data[self.local_app].update({"data": json.dumps(new_data)})
+        # Apply only the changed keys to the old data, which is saved for a next
+        # diff check when the hook ends (see _on_pre_commit).
+        if added or changed or deleted:
+            for key in deleted:
+                del old_data[key]
+            old_data.update(updated_data)
+            self._unsaved_diffs.add(relation_id)
 
         # Return the diff with all possible changes.
-        return Diff(added, changed, deleted)
+        return Diff(frozenset(added), frozenset(changed), deleted)
+
+    def _on_pre_commit(self, _) -> None:
+        """Saves the diff data that changed during the hook in the relation databags.
+
+        The data is serialized once per hook, no matter how many times it changed.
+        Keys are sorted so the same data always serializes to the same string.
+        """
+        for relation_id in self._unsaved_diffs:
+            raw_data, data = self._diff_cache[relation_id]
+            new_raw_data = _dumps(data)
+            if new_raw_data != raw_data:
+                self._update_relation_data(relation_id, {"data": new_raw_data})
+                self._diff_cache[relation_id] = (new_raw_data, data)
+        self._unsaved_diffs.clear()
 
     def _on_relation_changed(self, event: RelationChangedEvent) -> None:
         """Event emitted when the database relation has changed."""
@@ -181,10 +275,18 @@ class DatabaseProvides(Object):
         # Check which data has changed to emit customs events.
         diff = self._diff(event)
 
-        # Emit a database requested event if the setup key (database name and optional
-        # extra user roles) was added to the relation databag by the application.
-        if "database" in diff.added:
-            self.on.database_requested.emit(event.relation, app=event.app, unit=event.unit)
+        # Emit the trigger event (database requested) once if any of the trigger keys
+        # (the database name) was added to the relation databag by the application.
+        # The optional extra user roles are read from the event, but don't trigger it.
+        if self.TRIGGER_KEYS & diff.added:
+            getattr(self.on, self.TRIGGER_EVENT_NAME).emit(
+                event.relation, app=event.app, unit=event.unit
+            )
+
+    def _on_relation_broken(self, event: RelationBrokenEvent) -> None:
+        """Event emitted when the database relation is removed."""
+        self._diff_cache.pop(event.relation.id, None)
+        self._unsaved_diffs.discard(event.relation.id)
 
     def fetch_relation_data(self) -> dict:
         """Retrieves data from relation.
@@ -198,9 +300,10 @@ class DatabaseProvides(Object):
         """
         data = {}
         for relation in self.relations:
-            data[relation.id] = {
-                key: value for key, value in relation.data[relation.app].items() if key != "data"
-            }
+            # Copy the relation data without the diff data.
+            relation_data = dict(relation.data[relation.app])
+            relation_data.pop("data", None)
+            data[relation.id] = relation_data
         return data
 
     def _update_relation_data(self, relation_id: int, data: dict) -> None:
@@ -214,14 +317,75 @@ class DatabaseProvides(Object):
             data: dict containing the key-value pairs
                 that should be updated in the relation.
         """
+        # Defer the update to the end of the batch if one is open for the relation.
+        if relation_id in self._batches:
+            self._batches[relation_id].update(data)
+            return
+
         if self.local_unit.is_leader():
             relation = self.charm.model.get_relation(self.relation_name, relation_id)
             relation.data[self.local_app].update(data)
 
     @property
     def relations(self) -> List[Relation]:
-        """The list of Relation instances associated with this relation_name."""
-        return list(self.charm.model.relations[self.relation_name])
+        """The list of Relation instances associated with this relation_name.
+
+        This is the list kept by the model, so it shouldn't be modified.
+        """
+        return self.charm.model.relations[self.relation_name]
+
+    @contextmanager
+    def batch(self, relation_id: int) -> Iterator["DatabaseProvides"]:
+        """Groups the relation data set in a block into a single relation data update.
+
+        The data is only written when the block exits without errors.
+
+        Example:
+            with self.provided_database.batch(relation_id) as database:
+                database.set_endpoints(relation_id, "host1:port,host2:port")
+                database.set_tls(relation_id, "True")
+
+        Args:
+            relation_id: the identifier for a particular relation.
+
+        Yields:
+            this instance, whose setters accumulate the data for the relation.
+        """
+        # Nested batches are flushed by the outermost one.
+        if relation_id in self._batches:
+            yield self
+            return
+
+        self._batches[relation_id] = data = {}
+        try:
+            yield self
+        finally:
+            del self._batches[relation_id]
+        if data:
+            self._update_relation_data(relation_id, data)
+
+    def set_many(self, relation_id: int, **fields: str) -> None:
+        """Set several fields in the application relation databag at once.
+
+        This function writes in the application data bag, therefore,
+        only the leader unit can call it.
+
+        Args:
+            relation_id: the identifier for a particular relation.
+            fields: values to set, named like the corresponding setters
+                (e.g. username, endpoints, read_only_endpoints or tls_ca).
+
+        Raises:
+            ValueError: if a field can't be set with any of the setters.
+        """
+        unknown_fields = fields.keys() - _RELATION_DATA_KEYS.keys()
+        if unknown_fields:
+            raise ValueError(f"Unknown relation data fields: {', '.join(sorted(unknown_fields))}")
+
+        self._update_relation_data(
+            relation_id,
+            {_RELATION_DATA_KEYS[field]: value for field, value in fields.items()},
+        )
 
     def set_credentials(self, relation_id: int, username: str, password: str) -> None:
         """Set database primary connections.
@@ -234,13 +398,7 @@ class DatabaseProvides(Object):
             username: user that was created.
             password: password of the created user.
         """
-        self._update_relation_data(
-            relation_id,
-            {
-                "username": username,
-                "password": password,
-            },
-        )
+        self.set_many(relation_id, username=username, password=password)
 
     def set_endpoints(self, relation_id: int, connection_strings: str) -> None:
         """Set database primary connections.
@@ -264,7 +422,7 @@ class DatabaseProvides(Object):
             relation_id: the identifier for a particular relation.
             connection_strings: database hosts and ports comma separated list.
         """
-        self._update_relation_data(relation_id, {"read-only-endpoints": connection_strings})
+        self.set_many(relation_id, read_only_endpoints=connection_strings)
 
     def set_replset(self, relation_id: int, replset: str) -> None:
         """Set replica set name in the application relation databag.
@@ -139,7 +139,7 @@ LIBAPI = 0
 
 # Increment this PATCH version before using `charmcraft publish-lib` or reset
 # to 0 if you are raising the major API version
-LIBPATCH = 1
+LIBPATCH = 2
 
 logger = logging.getLogger(__name__)
 
@@ -180,8 +180,10 @@ def diff(event: RelationChangedEvent, bucket: str) -> Diff:
 
     # TODO: evaluate the possibility of losing the diff if some error
     # happens in the charm before the diff is completely checked (DPE-412).
-    # Convert the new_data to a serializable format and save it for a next diff check.
-    event.relation.data[bucket].update({"data": json.dumps(new_data)})
+    # Convert the new_data to a serializable format and save it for a next diff check
+    # (only if something changed, to avoid writing the same data again).
+    if added or changed or deleted:
+        event.relation.data[bucket].update({"data": json.dumps(new_data)})
 
     # Return the diff with all possible changes.
     return Diff(added, changed, deleted)
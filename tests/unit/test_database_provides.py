@@ -74,6 +74,7 @@ class TestDatabaseProvides(unittest.TestCase):
         # Test with new data added to the relation databag.
         result = self.harness.charm.database._diff(mock_event)
         assert result == Diff({"username", "password"}, set(), set())
+        assert all(isinstance(keys, frozenset) for keys in result)
 
         # Test with the same data.
         result = self.harness.charm.database._diff(mock_event)
@@ -90,6 +91,36 @@ class TestDatabaseProvides(unittest.TestCase):
         result = self.harness.charm.database._diff(mock_event)
         assert result == Diff(set(), set(), {"username", "password"})
 
+    def test_diff_reuses_cached_data(self):
+        """Asserts that the diff data saved by the charm library is not parsed again."""
+        # Diff and save the diff data in the relation databag, like at the end of a hook.
+        self.harness.update_relation_data(self.rel_id, "application", {"database": DATABASE})
+        self.harness.framework.commit()
+
+        # The next diffs reuse the saved data, even with changes not saved yet.
+        with patch("charms.data_platform_libs.v0.database_provides._loads") as _loads:
+            self.harness.update_relation_data(self.rel_id, "application", {"tls": "True"})
+            self.harness.update_relation_data(self.rel_id, "application", {"tls": "False"})
+        _loads.assert_not_called()
+
+        self.harness.framework.commit()
+        assert (
+            self.harness.get_relation_data(self.rel_id, "database")["data"]
+            == '{"database":"data_platform","tls":"False"}'
+        )
+
+    def test_diff_data_saved_on_commit(self):
+        """Asserts that the diff data is only saved in the relation databag when the hook ends."""
+        self.harness.update_relation_data(self.rel_id, "application", {"database": DATABASE})
+        assert "data" not in self.harness.get_relation_data(self.rel_id, "database")
+
+        # Simulate the end of the hook.
+        self.harness.framework.commit()
+        assert (
+            self.harness.get_relation_data(self.rel_id, "database")["data"]
+            == '{"database":"data_platform"}'
+        )
+
     @patch.object(DatabaseCharm, "_on_database_requested")
     def test_on_database_requested(self, _on_database_requested):
         """Asserts that the correct hook is called when a new database is requested."""
@@ -109,6 +140,27 @@ class TestDatabaseProvides(unittest.TestCase):
         assert event.database == DATABASE
         assert event.extra_user_roles == EXTRA_USER_ROLES
 
+    @patch.object(DatabaseCharm, "_on_database_requested")
+    def test_on_database_requested_non_leader(self, _on_database_requested):
+        """Asserts that the database requested event is only emitted on the leader unit."""
+        # Simulate that the leadership moved to another unit.
+        self.harness.set_leader(False)
+        self.harness.update_relation_data(self.rel_id, "application", {"database": DATABASE})
+
+        # Assert no event was emitted.
+        _on_database_requested.assert_not_called()
+
+    def test_set_endpoints_after_losing_leadership(self):
+        """Asserts that the relation data is not written once the unit is no longer the leader."""
+        self.harness.charm.database.set_endpoints(self.rel_id, "host1:port")
+        self.harness.set_leader(False)
+        self.harness.charm.database.set_endpoints(self.rel_id, "host2:port")
+
+        # Only the update made as the leader was written.
+        assert self.harness.get_relation_data(self.rel_id, "database") == {
+            "endpoints": "host1:port"
+        }
+
     def test_set_credentials(self):
         """Asserts that the database name is in the relation databag when it's requested."""
         # Set the credentials in the relation using the provides charm library.
@@ -116,7 +168,6 @@ class TestDatabaseProvides(unittest.TestCase):
 
         # Check that the credentials are present in the relation.
         assert self.harness.get_relation_data(self.rel_id, "database") == {
-            "data": "{}",  # Data is the diff stored between multiple relation changed events.
             "username": "test-username",
             "password": "test-password",
         }
@@ -154,7 +205,6 @@ class TestDatabaseProvides(unittest.TestCase):
 
         # Check that the additional fields are present in the relation.
         assert self.harness.get_relation_data(self.rel_id, "database") == {
-            "data": "{}",  # Data is the diff stored between multiple relation changed events.
             "replset": "rs0",
             "tls": "True",
             "tls_ca": "Canonical",
@@ -162,6 +212,57 @@ class TestDatabaseProvides(unittest.TestCase):
             "version": "1.0",
         }
 
+    def test_set_many(self):
+        """Asserts that several fields are set in the relation databag at once."""
+        self.harness.charm.database.set_many(
+            self.rel_id, endpoints="host1:port", read_only_endpoints="host2:port", tls="True"
+        )
+
+        assert self.harness.get_relation_data(self.rel_id, "database") == {
+            "endpoints": "host1:port",
+            "read-only-endpoints": "host2:port",
+            "tls": "True",
+        }
+
+    def test_set_many_unknown_field(self):
+        """Asserts that only the fields that have a setter can be set."""
+        with self.assertRaises(ValueError):
+            self.harness.charm.database.set_many(self.rel_id, endpoints="host1:port", data="{}")
+
+        # Nothing was written in the relation.
+        assert self.harness.get_relation_data(self.rel_id, "database") == {}
+
+    def test_batch(self):
+        """Asserts that the fields set in a batch are written with a single update."""
+        relation = self.harness.charm.model.get_relation(RELATION_NAME, self.rel_id)
+        relation_data = relation.data[self.harness.charm.app]
+        with patch.object(relation_data, "update", wraps=relation_data.update) as update:
+            with self.harness.charm.database.batch(self.rel_id) as database:
+                database.set_endpoints(self.rel_id, "host1:port")
+                database.set_tls(self.rel_id, "True")
+                database.set_version(self.rel_id, "1.0")
+
+                # Nothing is written until the batch ends.
+                assert self.harness.get_relation_data(self.rel_id, "database") == {}
+
+        update.assert_called_once_with(
+            {"endpoints": "host1:port", "tls": "True", "version": "1.0"}
+        )
+        assert self.harness.get_relation_data(self.rel_id, "database") == {
+            "endpoints": "host1:port",
+            "tls": "True",
+            "version": "1.0",
+        }
+
+    def test_diff_cache_cleared_on_relation_broken(self):
+        """Asserts that the diff data of a relation is dropped when the relation is removed."""
+        self.harness.update_relation_data(self.rel_id, "application", {"database": DATABASE})
+        assert self.rel_id in self.harness.charm.database._diff_cache
+
+        self.harness.remove_relation(self.rel_id)
+        assert self.rel_id not in self.harness.charm.database._diff_cache
+        assert self.rel_id not in self.harness.charm.database._unsaved_diffs
+
     def test_fetch_relation_data(self):
         # Set some data in the relation.
         self.harness.update_relation_data(self.rel_id, "application", {"database": DATABASE})
@@ -261,7 +261,6 @@ class TestS3Provider(unittest.TestCase):
 
         # Check that the additional fields are present in the relation.
         assert self.harness.get_relation_data(self.rel_id, "s3_app") == {
-            "data": "{}",  # Data is the diff stored between multiple relation changed events.
             "access-key": "test-access-key",
             "secret-key": "test-secret-key",
             "bucket": "test-bucket",